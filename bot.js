@@ -1,10 +1,14 @@
 require('dotenv').config();
-const { Client, GatewayIntentBits, Partials, EmbedBuilder, REST, Routes, ActionRowBuilder, ButtonBuilder, ButtonStyle, ChannelType } = require('discord.js');
+// DNS lookups and response decompression for concurrent sheet polls share libuv's thread pool
+// (4 threads by default); it has to be sized before anything uses it
+process.env.UV_THREADPOOL_SIZE ||= '16';
+const { Client, GatewayIntentBits, Partials, EmbedBuilder, REST, Routes, ActionRowBuilder, ButtonBuilder, ButtonStyle, ChannelType, embedLength } = require('discord.js');
 const { google } = require('googleapis');
 const { MongoClient } = require('mongodb');
 const express = require('express');
 const { RateLimiter } = require('limiter');
 const fetch = require('node-fetch');
+const crypto = require('crypto');
 
 // Error handling
 process.on('unhandledRejection', (error) => {
@@ -14,6 +18,12 @@ process.on('uncaughtException', (error) => {
   console.error('Uncaught Exception:', error);
 });
 
+// Verbose logging is opt-in (LOG_LEVEL=debug); routine polling stays off stdout
+const DEBUG = process.env.LOG_LEVEL === 'debug';
+function debugLog(...args) {
+  if (DEBUG) console.log(...args);
+}
+
 // Rate limiter
 const limiter = new RateLimiter({ tokensPerInterval: 50, interval: 'minute' });
 
@@ -374,10 +384,84 @@ const client = new Client({
 const SCOPES = ['https://www.googleapis.com/auth/spreadsheets.readonly', 'https://www.googleapis.com/auth/drive.readonly'];
 const serviceAccount = JSON.parse(process.env.GOOGLE_SERVICE_ACCOUNT_JSON);
 
-// MongoDB setup
-const mongoClient = new MongoClient(process.env.MONGO_URI, {
-  useNewUrlParser: true,
-  useUnifiedTopology: true,
+// Form tracking settings, overridable from .env; invalid values fall back to the defaults
+const MAX_TIMER_MS = 2147483647; // Node fires longer timers after 1ms
+
+function intervalEnv(name, fallback) {
+  const value = Number(process.env[name]);
+  return Number.isFinite(value) && value > 0 ? Math.min(value, MAX_TIMER_MS) : fallback;
+}
+
+function colorEnv(name, fallback) {
+  const value = process.env[name]?.trim().replace(/^#/, '');
+  return value && /^[0-9a-f]{1,6}$/i.test(value) ? parseInt(value, 16) : fallback;
+}
+
+const POLL_INTERVAL_MS = intervalEnv('POLL_INTERVAL_MS', 900000);
+const POLL_MAX_INTERVAL_MS = Math.max(intervalEnv('POLL_MAX_INTERVAL_MS', 8 * POLL_INTERVAL_MS), POLL_INTERVAL_MS);
+const FORM_EMBED_COLOR = colorEnv('FORM_EMBED_COLOR', 0x00FF00);
+const FORM_EMBED_INLINE = process.env.FORM_EMBED_INLINE === 'true';
+
+// Drive push notifications (optional, needs a public HTTPS URL for the webhook)
+const PUBLIC_URL = process.env.PUBLIC_URL?.replace(/\/+$/, '');
+const WATCH_TTL_MS = 24 * 60 * 60 * 1000; // Drive caps file watch channels at 1 day
+const WATCH_RENEW_MARGIN_MS = 60 * 60 * 1000;
+const watchRenewals = new Map();
+
+// Split the raw credentials out of a URI the driver can't be trusted with (e.g. ':', '/' or '@' in the password)
+function splitMongoCredentials(uri) {
+  const userinfoStart = uri.indexOf('://') + 3;
+  const userinfoEnd = uri.lastIndexOf('@');
+  if (userinfoStart < 3 || userinfoEnd < userinfoStart) return null;
+
+  const userinfo = uri.slice(userinfoStart, userinfoEnd);
+  const separator = userinfo.indexOf(':');
+  return {
+    uri: uri.slice(0, userinfoStart) + uri.slice(userinfoEnd + 1),
+    auth: separator === -1
+      ? { username: userinfo }
+      : { username: userinfo.slice(0, separator), password: userinfo.slice(separator + 1) }
+  };
+}
+
+// More than one '@' before the path means an unescaped '@' in the credentials
+function hasUnescapedAt(uri) {
+  const authorityStart = uri.indexOf('://') + 3;
+  if (authorityStart < 3) return false;
+  const pathStart = uri.indexOf('/', authorityStart);
+  const authority = uri.slice(authorityStart, pathStart === -1 ? undefined : pathStart);
+  return authority.indexOf('@') !== authority.lastIndexOf('@');
+}
+
+// Let the driver parse the URI as given; if it can't, hand it the credentials
+// as options instead so they never need quoting
+function createMongoClient(uri, options) {
+  const split = splitMongoCredentials(uri);
+  // mongodb+srv:// URIs don't reject an unescaped '@', they quietly read part of
+  // the password as the host, so don't give the driver the chance
+  if (split && hasUnescapedAt(uri)) {
+    return new MongoClient(split.uri, { ...options, auth: split.auth });
+  }
+
+  try {
+    return new MongoClient(uri, options);
+  } catch (error) {
+    if (!split) throw error;
+    try {
+      return new MongoClient(split.uri, { ...options, auth: split.auth });
+    } catch {
+      throw error;
+    }
+  }
+}
+
+// MongoDB setup - one client for the whole process, sharing a warm connection pool
+const mongoClient = createMongoClient(process.env.MONGO_URI, {
+  appName: 'prs-helper',
+  maxPoolSize: 20,
+  minPoolSize: 2,
+  maxIdleTimeMS: 60000,
+  serverSelectionTimeoutMS: 5000,
   retryWrites: true,
   retryReads: true
 });
@@ -413,6 +497,22 @@ async function initializeDatabase() {
     ticketSettingsCollection = db.collection('ticket_settings');
     activeTicketsCollection = db.collection('active_tickets');
 
+    // Indexes for the keys every lookup and upsert filters on (createIndex is a no-op if they exist)
+    const indexes = [
+      [formChannelsCollection, { guild_id: 1, spreadsheet_id: 1 }, { unique: true }],
+      [lastRowsCollection, { guild_id: 1, spreadsheet_id: 1, sheet_name: 1 }, { unique: true }],
+      [permissionsCollection, { user_id: 1, guild_id: 1, permission: 1 }, { unique: true }],
+      [ticketSettingsCollection, { guild_id: 1 }, { unique: true }],
+      [activeTicketsCollection, { channel_id: 1 }, {}]
+    ];
+    await Promise.all(indexes.map(async ([collection, keys, options]) => {
+      try {
+        await collection.createIndex(keys, options);
+      } catch (error) {
+        console.warn(`⚠️ Failed to create ${collection.collectionName} index:`, error.message);
+      }
+    }));
+
     const docs = await formChannelsCollection.find().toArray();
     formChannels = new Map();
     
@@ -425,7 +525,8 @@ async function initializeDatabase() {
         channelId: doc.channel_id,
         sheet_name: doc.sheet_name,
         guild_id: doc.guild_id,
-        spreadsheet_id: doc.spreadsheet_id
+        spreadsheet_id: doc.spreadsheet_id,
+        watch: doc.watch
       });
     });
     
@@ -448,84 +549,324 @@ async function hasPermission(userId, guildId, permission) {
   return !!permissionDoc;
 }
 
-// Google auth
+// Google auth - authorize once and reuse the client; it refreshes its own token
+let authClientPromise = null;
 async function getAuthClient() {
-  try {
-    const auth = new google.auth.JWT({
-      email: serviceAccount.client_email,
-      key: serviceAccount.private_key.replace(/\\n/g, '\n'),
-      scopes: SCOPES
+  if (!authClientPromise) {
+    authClientPromise = (async () => {
+      const auth = new google.auth.JWT({
+        email: serviceAccount.client_email,
+        key: serviceAccount.private_key.replace(/\\n/g, '\n'),
+        scopes: SCOPES
+      });
+      await auth.authorize();
+      return auth;
+    })().catch(error => {
+      authClientPromise = null;
+      console.error('❌ Google auth failed:', error);
+      throw error;
     });
-    await auth.authorize();
-    return auth;
+  }
+  return authClientPromise;
+}
+
+// Register a Drive push notification channel so Google tells us when the sheet changes
+async function watchSpreadsheet(key) {
+  const config = formChannels.get(key);
+  if (!PUBLIC_URL || !config) return;
+
+  const auth = await getAuthClient();
+  const drive = google.drive({ version: 'v3', auth });
+  const watch = {
+    id: crypto.randomUUID(),
+    token: crypto.randomBytes(24).toString('hex')
+  };
+  const { data } = await drive.files.watch({
+    fileId: config.spreadsheet_id,
+    requestBody: {
+      id: watch.id,
+      type: 'web_hook',
+      address: `${PUBLIC_URL}/gdrive-webhook`,
+      token: watch.token,
+      expiration: Date.now() + WATCH_TTL_MS
+    }
+  });
+  watch.resource_id = data.resourceId;
+  watch.expiration = Number(data.expiration);
+
+  // Stop the channel we are replacing so Google doesn't notify us twice
+  const previous = config.watch;
+  config.watch = watch;
+  await stopWatch(previous);
+  await formChannelsCollection.updateOne(
+    { guild_id: config.guild_id, spreadsheet_id: config.spreadsheet_id },
+    { $set: { watch } }
+  );
+  scheduleWatchRenewal(key);
+  console.log(`👀 Watching ${config.sheet_name} until ${new Date(watch.expiration).toISOString()}`);
+}
+
+function scheduleWatchRenewal(key) {
+  clearTimeout(watchRenewals.get(key));
+  const config = formChannels.get(key);
+  if (!config?.watch) return;
+
+  const delay = Math.max(config.watch.expiration - Date.now() - WATCH_RENEW_MARGIN_MS, 0);
+  watchRenewals.set(key, setTimeout(() => {
+    watchSpreadsheet(key).catch(error => {
+      console.error(`❌ Failed to renew watch for ${config.sheet_name}:`, error.message);
+    });
+  }, delay));
+}
+
+async function stopWatch(watch) {
+  if (!watch?.id || !watch.resource_id || watch.expiration < Date.now()) return;
+  try {
+    const auth = await getAuthClient();
+    const drive = google.drive({ version: 'v3', auth });
+    await drive.channels.stop({ requestBody: { id: watch.id, resourceId: watch.resource_id } });
   } catch (error) {
-    console.error('❌ Google auth failed:', error);
-    throw error;
+    console.warn(`⚠️ Failed to stop watch channel ${watch.id}:`, error.message);
   }
 }
 
-// Fetch responses with rate limiting
-async function fetchResponses(spreadsheetId, sheetName) {
+async function unwatchSpreadsheet(key) {
+  clearTimeout(watchRenewals.get(key));
+  watchRenewals.delete(key);
+  await stopWatch(formChannels.get(key)?.watch);
+}
+
+// Renew missing/expiring watches on startup, reuse the rest
+async function initializeWatches() {
+  if (!PUBLIC_URL) {
+    console.log('ℹ️ PUBLIC_URL not set, relying on polling only');
+    return;
+  }
+  for (const [key, config] of formChannels) {
+    try {
+      if (!config.watch || config.watch.expiration - Date.now() < WATCH_RENEW_MARGIN_MS) {
+        await watchSpreadsheet(key);
+      } else {
+        scheduleWatchRenewal(key);
+      }
+    } catch (error) {
+      console.error(`❌ Failed to watch ${config.sheet_name}:`, error.message);
+    }
+  }
+}
+
+// Column headers rarely change, so keep them per tab instead of re-reading row 1 every poll
+const headerCache = new Map();
+
+// A1 range on a tab; quotes in the tab title are escaped by doubling them
+function sheetRange(sheetName, range) {
+  return `'${sheetName.replace(/'/g, "''")}'!${range}`;
+}
+
+// Fetch the rows after lastRow for the given tabs (plus any uncached headers) in a single request
+async function fetchTabs(spreadsheetId, tabs) {
   await limiter.removeTokens(1);
+  const auth = await getAuthClient();
+  const sheets = google.sheets({ version: 'v4', auth });
+
+  const ranges = [];
+  const plan = tabs.map(tab => {
+    const cacheKey = `${spreadsheetId}:${tab.sheetName}`;
+    // Rows after lastRow would start past the end of the grid, which the API rejects
+    if (tab.lastRow + 1 >= tab.rowCount) return { tab, cacheKey, headerIndex: -1, dataIndex: -1 };
+    const headerIndex = headerCache.has(cacheKey) ? -1 : ranges.push(sheetRange(tab.sheetName, '1:1')) - 1;
+    const dataIndex = ranges.push(sheetRange(tab.sheetName, `A${tab.lastRow + 2}:Z`)) - 1;
+    return { tab, cacheKey, headerIndex, dataIndex };
+  });
+
+  const valueRanges = ranges.length
+    ? (await sheets.spreadsheets.values.batchGet({ spreadsheetId, ranges })).data.valueRanges || []
+    : [];
+
+  const responses = [];
+  for (const { tab, cacheKey, headerIndex, dataIndex } of plan) {
+    if (dataIndex < 0) {
+      responses.push({ ...tab, headers: headerCache.get(cacheKey) || [], values: [] });
+      continue;
+    }
+    if (headerIndex >= 0) headerCache.set(cacheKey, valueRanges[headerIndex]?.values?.[0] || []);
+    const values = valueRanges[dataIndex]?.values || [];
+
+    // A row wider than the cached headers means a question was added to the form
+    if (values.some(row => row.length > headerCache.get(cacheKey).length)) {
+      const { data: headerData } = await sheets.spreadsheets.values.get({
+        spreadsheetId,
+        range: sheetRange(tab.sheetName, '1:1')
+      });
+      headerCache.set(cacheKey, headerData.values?.[0] || []);
+    }
+
+    responses.push({ ...tab, headers: headerCache.get(cacheKey), values });
+  }
+  return responses;
+}
+
+// Fetch every tab in one batch; if one bad tab breaks the batch, fall back to one request per tab
+// so the other tabs still get their rows. complete is false when any tab couldn't be read.
+async function fetchResponses(spreadsheetId, tabs) {
   try {
-    const auth = await getAuthClient();
-    const sheets = google.sheets({ version: 'v4', auth });
+    return { responses: await fetchTabs(spreadsheetId, tabs), complete: true };
+  } catch (error) {
+    if (tabs.length <= 1) {
+      console.error(`❌ Failed to fetch ${spreadsheetId}:`, error.message);
+      return { responses: [], complete: false };
+    }
+    console.warn(`⚠️ Batch fetch of ${spreadsheetId} failed, fetching tabs one by one:`, error.message);
+  }
 
-    const [headerResponse, dataResponse] = await Promise.all([
-      sheets.spreadsheets.values.get({ spreadsheetId, range: `'${sheetName}'!1:1` }),
-      sheets.spreadsheets.values.get({ spreadsheetId, range: `'${sheetName}'!A2:Z` })
-    ]);
+  const responses = [];
+  let complete = true;
+  for (const tab of tabs) {
+    try {
+      responses.push(...await fetchTabs(spreadsheetId, [tab]));
+    } catch (error) {
+      complete = false;
+      console.error(`❌ Failed to fetch ${tab.sheetName}:`, error.message);
+    }
+  }
+  return { responses, complete };
+}
 
-    return {
-      headers: headerResponse.data.values?.[0] || [],
-      values: dataResponse.data.values || []
-    };
+// Grid tabs of each spreadsheet, so polls don't re-read the spreadsheet metadata every time
+const SHEET_TABS_TTL_MS = 60 * 60 * 1000;
+const sheetTabsCache = new Map();
+
+async function getSheetTabs(spreadsheetId, maxAgeMs = SHEET_TABS_TTL_MS) {
+  const cached = sheetTabsCache.get(spreadsheetId);
+  if (cached && Date.now() - cached.fetchedAt < maxAgeMs) return cached.tabs;
+
+  const auth = await getAuthClient();
+  const sheets = google.sheets({ version: 'v4', auth });
+  const { data } = await sheets.spreadsheets.get({
+    spreadsheetId,
+    fields: 'sheets.properties(title,sheetType,gridProperties.rowCount)'
+  });
+  // Chart sheets have no cells to read
+  const tabs = data.sheets
+    .filter(sheet => sheet.properties.sheetType === 'GRID')
+    .map(sheet => ({
+      title: sheet.properties.title,
+      rowCount: sheet.properties.gridProperties?.rowCount || 0
+    }));
+  sheetTabsCache.set(spreadsheetId, { tabs, fetchedAt: Date.now() });
+  return tabs;
+}
+
+// last_row progress is kept in memory and written to MongoDB in batches
+const LAST_ROW_FLUSH_INTERVAL_MS = 30000;
+const lastRowCache = new Map();
+const pendingLastRows = new Map();
+
+async function loadLastRows(spreadsheetId, guildId) {
+  const cacheKey = `${guildId}:${spreadsheetId}`;
+  if (!lastRowCache.has(cacheKey)) {
+    // One query for every tab's progress instead of a round-trip per tab
+    const lastRowDocs = await lastRowsCollection
+      .find({ spreadsheet_id: spreadsheetId, guild_id: guildId })
+      .project({ sheet_name: 1, last_row: 1 })
+      .toArray();
+    lastRowCache.set(cacheKey, new Map(lastRowDocs.map(doc => [doc.sheet_name, doc.last_row])));
+  }
+  return lastRowCache.get(cacheKey);
+}
+
+function setLastRow(spreadsheetId, guildId, sheetName, lastRow) {
+  lastRowCache.get(`${guildId}:${spreadsheetId}`)?.set(sheetName, lastRow);
+  pendingLastRows.set(`${guildId}:${spreadsheetId}:${sheetName}`, {
+    filter: { spreadsheet_id: spreadsheetId, sheet_name: sheetName, guild_id: guildId },
+    last_row: lastRow
+  });
+}
+
+// Only one flush runs at a time; callers during a flush share it
+let lastRowFlush = null;
+function flushLastRows() {
+  lastRowFlush ||= writePendingLastRows().finally(() => {
+    lastRowFlush = null;
+  });
+  return lastRowFlush;
+}
+
+async function writePendingLastRows() {
+  if (!pendingLastRows.size) return;
+  const updates = [...pendingLastRows.entries()];
+  pendingLastRows.clear();
+  try {
+    await lastRowsCollection.bulkWrite(
+      updates.map(([_, { filter, last_row }]) => ({
+        updateOne: { filter, update: { $set: { last_row } }, upsert: true }
+      })),
+      { ordered: false }
+    );
   } catch (error) {
-    console.error(`❌ Failed to fetch ${sheetName}:`, error.message);
-    return null;
+    console.error('❌ Failed to save last rows:', error.message);
+    // Retry on the next flush unless a newer value is already waiting
+    updates.forEach(([key, update]) => {
+      if (!pendingLastRows.has(key)) pendingLastRows.set(key, update);
+    });
   }
 }
 
-// Process spreadsheet with retries - UPDATED
+// Drive bumps a file's version on every change, which makes a cheap "anything new?" check
+const spreadsheetVersions = new Map();
+
+async function getSpreadsheetVersion(spreadsheetId) {
+  const auth = await getAuthClient();
+  const drive = google.drive({ version: 'v3', auth });
+  const { data } = await drive.files.get({ fileId: spreadsheetId, fields: 'version' });
+  return data.version;
+}
+
+// Process spreadsheet with retries, resolving to the number of new responses posted
 async function processSpreadsheet(spreadsheetId, channelId, guildId, retries = 3) {
   if (!spreadsheetId) throw new Error('Missing spreadsheetId');
   if (!guildId) throw new Error('Missing guildId');
 
   for (let attempt = 1; attempt <= retries; attempt++) {
     try {
-      const auth = await getAuthClient();
-      const sheets = google.sheets({ version: 'v4', auth });
-      const metadata = await sheets.spreadsheets.get({ spreadsheetId });
-      const sheetNames = metadata.data.sheets.map(sheet => sheet.properties.title);
-
-      for (const sheetName of sheetNames) {
-        const response = await fetchResponses(spreadsheetId, sheetName);
-        if (!response?.values) continue;
-
-        const lastRowDoc = await lastRowsCollection.findOne({ 
-          spreadsheet_id: spreadsheetId,
-          sheet_name: sheetName,
-          guild_id: guildId
-        });
-        const lastProcessedRow = lastRowDoc?.last_row || 0;
-
-        if (response.values.length > lastProcessedRow) {
-          const newResponses = response.values.slice(lastProcessedRow);
-          await sendResponses(channelId, response.headers, newResponses, sheetName);
-          
-          await lastRowsCollection.updateOne(
-            { 
-              spreadsheet_id: spreadsheetId,
-              sheet_name: sheetName,
-              guild_id: guildId
-            },
-            { $set: { last_row: response.values.length } },
-            { upsert: true }
-          );
-          console.log(`✅ Processed ${newResponses.length} new responses from ${sheetName}`);
-        }
+      // Skip the values download entirely when the file hasn't changed since the last poll
+      const versionKey = `${guildId}:${spreadsheetId}`;
+      const version = await getSpreadsheetVersion(spreadsheetId);
+      if (version && spreadsheetVersions.get(versionKey) === version) return 0;
+
+      const lastRows = await loadLastRows(spreadsheetId, guildId);
+      let sheetTabs = await getSheetTabs(spreadsheetId);
+      // A tab read up to its last grid row may have grown since; check before skipping it
+      if (sheetTabs.some(({ title, rowCount }) => (lastRows.get(title) || 0) + 1 >= rowCount)) {
+        sheetTabs = await getSheetTabs(spreadsheetId, 60000);
       }
-      return;
+
+      const { responses, complete } = await fetchResponses(
+        spreadsheetId,
+        sheetTabs.map(({ title, rowCount }) => ({
+          sheetName: title,
+          rowCount,
+          lastRow: lastRows.get(title) || 0
+        }))
+      );
+
+      let processed = 0;
+      for (const { sheetName, lastRow, headers, values: newResponses } of responses) {
+        if (!newResponses.length) continue;
+
+        await sendResponses(channelId, headers, newResponses, sheetName);
+
+        setLastRow(spreadsheetId, guildId, sheetName, lastRow + newResponses.length);
+        processed += newResponses.length;
+        console.log(`✅ Processed ${newResponses.length} new responses from ${sheetName}`);
+      }
+      if (complete) {
+        spreadsheetVersions.set(versionKey, version);
+      } else {
+        // A tab may have been renamed or deleted; re-read the tabs and retry it next poll
+        sheetTabsCache.delete(spreadsheetId);
+      }
+      return processed;
     } catch (error) {
       console.error(`Attempt ${attempt} failed for ${spreadsheetId}:`, error.message);
       if (attempt === retries) throw error;
@@ -534,38 +875,152 @@ async function processSpreadsheet(spreadsheetId, channelId, guildId, retries = 3
   }
 }
 
+// Discord message limits for form responses
+const MAX_EMBEDS_PER_MESSAGE = 10;
+const MAX_FIELDS_PER_EMBED = 25;
+const MAX_EMBED_CHARS_PER_MESSAGE = 6000;
+const MAX_SEND_RETRIES = 5;
+const channelQueues = new Map();
+
+// Run sends for one channel one after another so bursts keep their order
+function enqueueSend(channelId, task) {
+  const result = (channelQueues.get(channelId) || Promise.resolve()).then(task);
+  const tail = result.catch(() => {});
+  channelQueues.set(channelId, tail);
+  tail.then(() => {
+    if (channelQueues.get(channelId) === tail) channelQueues.delete(channelId);
+  });
+  return result;
+}
+
+// Retry rate-limited and server errors with capped exponential backoff
+async function sendWithBackoff(channel, payload) {
+  for (let attempt = 0; ; attempt++) {
+    try {
+      return await channel.send(payload);
+    } catch (error) {
+      const retryable = error.status === 429 || error.status >= 500;
+      if (!retryable || attempt >= MAX_SEND_RETRIES) throw error;
+      const delay = Math.min(2 ** attempt * 1000 + Math.random() * 1000, 60000);
+      console.warn(`⚠️ Send to ${channel.id} failed with ${error.status}, retrying in ${Math.round(delay)}ms`);
+      await new Promise(resolve => setTimeout(resolve, delay));
+    }
+  }
+}
+
+// Group embeds into as few messages as Discord allows
+function chunkEmbeds(embeds) {
+  const chunks = [];
+  let current = [];
+  let currentChars = 0;
+  for (const embed of embeds) {
+    const chars = embedLength(embed.data);
+    if (current.length && (current.length >= MAX_EMBEDS_PER_MESSAGE || currentChars + chars > MAX_EMBED_CHARS_PER_MESSAGE)) {
+      chunks.push(current);
+      current = [];
+      currentChars = 0;
+    }
+    current.push(embed);
+    currentChars += chars;
+  }
+  if (current.length) chunks.push(current);
+  return chunks;
+}
+
+// Look the channel up on every send; fall back to the API when it isn't cached
+// (e.g. right after a reconnect), instead of giving up on the batch
+async function resolveChannel(channelId) {
+  return client.channels.cache.get(channelId)
+    ?? await client.channels.fetch(channelId).catch(() => null);
+}
+
 // Send responses to Discord
 async function sendResponses(channelId, headers, responses, sheetName) {
-  const channel = client.channels.cache.get(channelId);
+  const channel = await resolveChannel(channelId);
   if (!channel) {
     console.error(`❌ Channel ${channelId} not found`);
     return;
   }
 
-  for (const response of responses) {
-    try {
-      const embed = new EmbedBuilder()
-        .setTitle(`📝 New Response (${sheetName})`)
-        .setColor(0x00FF00);
-
-      response.forEach((value, index) => {
-        const question = headers[index] || `Question ${index + 1}`;
-        embed.addFields({
-          name: question,
-          value: value?.toString().substring(0, 1000) || 'No response',
-          inline: false
-        });
-      });
+  // Work out the field names once per batch, then build each embed from plain data
+  const title = `📝 New Response (${sheetName})`;
+  const questions = Array.from({ length: MAX_FIELDS_PER_EMBED }, (_, index) =>
+    (headers[index] || `Question ${index + 1}`).substring(0, 256)
+  );
 
-      await channel.send({ embeds: [embed] });
+  const embeds = responses.map(response => new EmbedBuilder({
+    title,
+    color: FORM_EMBED_COLOR,
+    fields: response.slice(0, MAX_FIELDS_PER_EMBED).map((value, index) => ({
+      name: questions[index],
+      value: value?.toString().substring(0, 1000) || 'No response',
+      inline: FORM_EMBED_INLINE
+    }))
+  }));
+
+  for (const chunk of chunkEmbeds(embeds)) {
+    try {
+      await enqueueSend(channelId, () => sendWithBackoff(channel, { embeds: chunk }));
     } catch (error) {
-      console.error('❌ Failed to send response:', error);
+      console.error('❌ Failed to send responses:', error);
     }
   }
 }
 
-// Poll all sheets in parallel - UPDATED
-async function pollSheets() {
+// Polls, /checkupdates and Drive notifications can all hit the same form at once.
+// Only one run per form is in flight; anything arriving meanwhile shares one follow-up run.
+const spreadsheetRuns = new Map();
+
+function runSpreadsheet(config) {
+  const key = `${config.guild_id}:${config.spreadsheet_id}`;
+  const state = spreadsheetRuns.get(key);
+  if (state) {
+    state.next ||= state.current.catch(() => {}).then(() => startSpreadsheetRun(key));
+    return state.next;
+  }
+  return startSpreadsheetRun(key);
+}
+
+function startSpreadsheetRun(key) {
+  // Use the current mapping: the form may have been removed, or re-added to
+  // another channel, while this run was queued
+  const config = formChannels.get(key);
+  if (!config) {
+    spreadsheetRuns.delete(key);
+    return Promise.resolve(0);
+  }
+  const current = processSpreadsheet(config.spreadsheet_id, config.channelId, config.guild_id);
+  spreadsheetRuns.set(key, { current });
+  current.catch(() => {}).then(() => {
+    const state = spreadsheetRuns.get(key);
+    if (state?.current === current && !state.next) spreadsheetRuns.delete(key);
+  });
+  return current;
+}
+
+// Back off idle forms: double the wait after each empty poll, reset on new responses.
+// Forms with a live Drive watch only need the slowest fallback poll.
+function scheduleNextPoll(config, newResponses, now) {
+  config.idlePolls = newResponses ? 0 : (config.idlePolls || 0) + 1;
+  const interval = config.watch?.expiration > now
+    ? POLL_MAX_INTERVAL_MS
+    : Math.min(POLL_INTERVAL_MS * 2 ** config.idlePolls, POLL_MAX_INTERVAL_MS);
+  config.nextPollAt = now + interval;
+}
+
+// Scheduled ticks don't stack up behind a cycle that is still running
+let pollCycle = null;
+function pollSheets(options = {}) {
+  if (pollCycle && !options.force) return pollCycle;
+  const cycle = pollDueSheets(options).finally(() => {
+    if (pollCycle === cycle) pollCycle = null;
+  });
+  pollCycle = cycle;
+  return cycle;
+}
+
+// Poll all due sheets in parallel (force polls every sheet, e.g. for /checkupdates)
+async function pollDueSheets({ force = false } = {}) {
   // 1. Connection check
   if (!mongoClient.topology?.isConnected()) {
     console.log('⚠️ MongoDB disconnected, reconnecting...');
@@ -577,17 +1032,18 @@ async function pollSheets() {
     }
   }
 
-  console.log('🔍 Polling sheets...');
-  
-  // 2. Convert formChannels to array FIRST
-  const entriesArray = Array.from(formChannels.entries());
-  console.log('Debug - formChannels entries:', entriesArray);
-
-  if (entriesArray.length === 0) {
-    console.log('ℹ️ No spreadsheets being tracked');
+  if (formChannels.size === 0) {
+    debugLog('ℹ️ No spreadsheets being tracked');
     return;
   }
 
+  // 2. Convert formChannels to array FIRST, keeping only forms that are due
+  const startedAt = Date.now();
+  const entriesArray = Array.from(formChannels.entries())
+    // Half a tick of slack so normal timer lag doesn't push a due form to the next tick
+    .filter(([_, config]) => force || !(config.nextPollAt - POLL_INTERVAL_MS / 2 > startedAt));
+  debugLog(`🔍 Polling ${entriesArray.length} of ${formChannels.size} tracked forms...`);
+
   // 3. Create array of promises FIRST
   const pollingPromises = entriesArray.map(
     ([key, config]) => {
@@ -597,10 +1053,12 @@ async function pollSheets() {
             console.error('Invalid config for key', key, 'Full config:', config);
             throw new Error(`Missing spreadsheet_id in config`);
           }
-          await processSpreadsheet(config.spreadsheet_id, config.channelId, config.guild_id);
+          const newResponses = await runSpreadsheet(config);
+          scheduleNextPoll(config, newResponses, startedAt);
         } catch (error) {
           console.error(`❌ Failed polling in guild ${config.guild_id}:`, error.message);
           // Auto-clean invalid entries
+          await unwatchSpreadsheet(key);
           formChannels.delete(key);
           await formChannelsCollection.deleteOne({
             guild_id: config.guild_id,
@@ -613,22 +1071,17 @@ async function pollSheets() {
 
   // 4. Then pass to Promise.allSettled
   await Promise.allSettled(pollingPromises);
-  console.log('✅ Polling cycle completed');
+  debugLog('✅ Polling cycle completed');
 }
 
 // Discord bot setup
 client.once('ready', async () => {
   console.log(`🤖 Logged in as ${client.user.tag}`);
-  console.log('Intents:', client.options.intents);
+  debugLog('Intents:', client.options.intents);
   
   try {
     await initializeDatabase();
-    console.log('✅ Database collections initialized:');
-    console.log('- formChannelsCollection');
-    console.log('- lastRowsCollection');
-    console.log('- permissionsCollection');
-    console.log('- ticketSettingsCollection');
-    console.log('- activeTicketsCollection');
+    console.log('✅ Database collections initialized');
     
     const rest = new REST({ version: '10' }).setToken(process.env.DISCORD_TOKEN);
     try {
@@ -638,7 +1091,10 @@ client.once('ready', async () => {
       console.error('❌ Failed to register commands:', error);
     }
     
-    setInterval(pollSheets, 900000);
+    await initializeWatches();
+    // Polling stays on as a fallback for missed or unconfigured push notifications
+    setInterval(pollSheets, POLL_INTERVAL_MS);
+    setInterval(flushLastRows, LAST_ROW_FLUSH_INTERVAL_MS);
     console.log('✅ Bot operational');
   } catch (error) {
     console.error('❌ Startup error:', error);
@@ -728,6 +1184,7 @@ client.on('interactionCreate', async interaction => {
             config.guild_id === interaction.guild.id
           );
           if (entry) {
+            await unwatchSpreadsheet(entry[0]);
             formChannels.delete(entry[0]);
             await formChannelsCollection.deleteOne({ 
               spreadsheet_id: entry[1].spreadsheet_id,
@@ -1069,7 +1526,7 @@ Total to Pay - $${finalPrice}`;
           // Acknowledge the interaction immediately since polling might take time
           await interaction.deferReply({ ephemeral: true });
           // Run the polling function
-          await pollSheets();
+          await pollSheets({ force: true });
           // Get all forms in the current guild
           const guildForms = Array.from(formChannels.values())
             .filter(config => config.guild_id === interaction.guild.id);
@@ -1589,6 +2046,8 @@ client.on('messageCreate', async message => {
       const guildId = message.guild.id;
       const sheetName = spreadsheet.name;
       const spreadsheetId = spreadsheet.id;
+      // Make sure we can read it, and warm the tab cache for the first poll
+      await getSheetTabs(spreadsheetId);
       // Save to DB
       await formChannelsCollection.updateOne(
         { guild_id: guildId, spreadsheet_id: spreadsheetId },
@@ -1598,17 +2057,24 @@ client.on('messageCreate', async message => {
             channel_id: channelId,
             sheet_name: sheetName,
             spreadsheet_id: spreadsheetId
-          }
+          },
+          // The old watch channel is stopped below; don't let a restart reuse it
+          $unset: { watch: '' }
         },
         { upsert: true }
       );
       // Save to in-memory map
-      formChannels.set(`${guildId}:${spreadsheetId}`, {
+      const key = `${guildId}:${spreadsheetId}`;
+      if (formChannels.has(key)) await unwatchSpreadsheet(key);
+      formChannels.set(key, {
         channelId,
         sheet_name: sheetName,
         guild_id: guildId,
         spreadsheet_id: spreadsheetId
       });
+      watchSpreadsheet(key).catch(error => {
+        console.error(`❌ Failed to watch ${sheetName}, falling back to polling:`, error.message);
+      });
       clearUserState(userId);
       await message.reply({
         embeds: [
@@ -1631,6 +2097,10 @@ client.on('messageCreate', async message => {
 const app = express();
 const PORT = process.env.PORT || 3000;
 
+// Health checks hit this constantly; skip work they don't need
+app.disable('etag');
+app.disable('x-powered-by');
+
 // Basic health check endpoint
 app.get('/', (req, res) => {
   res.send({
@@ -1640,15 +2110,59 @@ app.get('/', (req, res) => {
   });
 });
 
+// Drive push notifications for watched spreadsheets
+function tokensMatch(received, expected) {
+  const a = Buffer.from(received || '');
+  const b = Buffer.from(expected || '');
+  return a.length === b.length && crypto.timingSafeEqual(a, b);
+}
+
+if (PUBLIC_URL) {
+  app.post('/gdrive-webhook', (req, res) => {
+    const channelId = req.get('X-Goog-Channel-ID');
+    if (!channelId) return res.sendStatus(403);
+
+    const config = [...formChannels.values()].find(config => config.watch && config.watch.id === channelId);
+    if (!config || !tokensMatch(req.get('X-Goog-Channel-Token'), config.watch.token)) {
+      return res.sendStatus(403);
+    }
+    res.sendStatus(200);
+
+    // The first message on a new channel is just a handshake
+    if (req.get('X-Goog-Resource-State') === 'sync') return;
+    runSpreadsheet(config).catch(error => {
+      console.error(`❌ Failed to process notification for ${config.sheet_name}:`, error.message);
+    });
+  });
+}
+
 // Error handling middleware
 app.use((err, req, res, next) => {
   console.error('Express error:', err);
   res.status(500).send('Internal Server Error');
 });
 
-app.listen(PORT, () => {
+const server = app.listen(PORT, () => {
   console.log(`Express server listening on port ${PORT}`);
 });
+// Keep connections open longer than the platform proxy does, so pings reuse them
+server.keepAliveTimeout = 65000;
+server.headersTimeout = 66000;
+
+// Save pending progress before the process goes away
+['SIGINT', 'SIGTERM'].forEach(signal => {
+  process.once(signal, async () => {
+    console.log(`${signal} received, saving progress...`);
+    // Let an interval flush that is already writing finish, then write whatever is left
+    if (lastRowFlush) await lastRowFlush;
+    await flushLastRows();
+    if (pendingLastRows.size) {
+      console.error(`❌ Dropped ${pendingLastRows.size} unsaved last_row updates; those responses will be posted again`);
+      process.exit(1);
+    }
+    process.exit(0);
+  });
+});
 
 // Ensure the bot logs in
 client.login(process.env.DISCORD_TOKEN);